@@ -1,25 +1,221 @@
 import sys
 import time
-import datetime
 import traceback
 import json
+import orjson
 import os
+import re
+import collections
+import functools
+import math
+import queue
+import threading
+import tempfile
 import requests # Import requests for direct API call
-import pandas as pd
-import pyupbit
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import numpy as np
+import websocket
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QGridLayout, QLabel, QLineEdit, QPushButton, QTextEdit, 
+    QGridLayout, QLabel, QLineEdit, QPushButton, QPlainTextEdit, 
     QGroupBox, QDoubleSpinBox, QMessageBox, QSplitter, QCheckBox,
     QComboBox, QCompleter
 )
-from PyQt6.QtCore import QThread, pyqtSignal, Qt, pyqtSlot
+from PyQt6.QtCore import QThread, pyqtSignal, Qt, pyqtSlot, QEvent, QStringListModel, QTimer
 from PyQt6.QtGui import QFont, QColor, QPalette
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.dates as mdates
+# Upbit public REST endpoints
+TICKER_URL = "https://api.upbit.com/v1/ticker"
+TRADES_URL = "https://api.upbit.com/v1/trades/ticks"
+CANDLES_URL = "https://api.upbit.com/v1/candles/minutes/1"
+MARKETS_URL = "https://api.upbit.com/v1/market/all?isDetails=false"
+HTTP_TIMEOUT = 3 # seconds
+CHART_TICKS = 50 # trades shown in the tick chart
+# One trade for the chart, seq is Upbit's sequential_id (dedupes REST / stream overlap)
+Tick = collections.namedtuple("Tick", "seq price")
+CONFIG_PATH = "config.json"
+WS_URL = "wss://api.upbit.com/websocket/v1"
+
+def _join_thread(thread, timeout_ms=2000):
+    """Waits for a QThread, terminates it as a last resort so closing can't hang."""
+    if not thread.wait(timeout_ms):
+        thread.terminate()
+        thread.wait(500)
+
+@functools.lru_cache(maxsize=4)
+def _load_config(path, mtime_ns):
+    """Parsed config file, cached per modification time. Treat the result as read-only."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def _pyupbit():
+    """pyupbit pulls in pandas (~300 ms), import it on first use instead of before the window shows."""
+    import pyupbit
+    return pyupbit
+
+def _wilder_rsi_seed_loop(closes, n):
+    """
+    Wilder's smoothed (avg_gain, avg_loss) over closes (oldest first), seeded
+    with the simple average of the first n changes. Needs len(closes) > n.
+    Scalar loop meant for numba, use _wilder_rsi_seed().
+    """
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n + 1):
+        delta = closes[i] - closes[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= n
+    avg_loss /= n
+    
+    for i in range(n + 1, closes.size):
+        delta = closes[i] - closes[i - 1]
+        avg_gain = (avg_gain * (n - 1) + (delta if delta > 0 else 0.0)) / n
+        avg_loss = (avg_loss * (n - 1) + (-delta if delta < 0 else 0.0)) / n
+    return avg_gain, avg_loss
+
+def _wilder_rsi_seed_numpy(closes, n):
+    """Same result as _wilder_rsi_seed_loop, fast enough without numba."""
+    delta = np.diff(closes)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    
+    avg_gain = float(gain[:n].mean())
+    avg_loss = float(loss[:n].mean())
+    # Loop over plain floats, indexing numpy scalars is several times slower
+    for g, l in zip(gain[n:].tolist(), loss[n:].tolist()):
+        avg_gain = (avg_gain * (n - 1) + g) / n
+        avg_loss = (avg_loss * (n - 1) + l) / n
+    return avg_gain, avg_loss
+
+@functools.lru_cache(maxsize=1)
+def _wilder_rsi_seed():
+    """
+    The seed implementation, resolved on first use from the worker thread:
+    importing numba costs ~200 ms, which must not delay the first frame.
+    numba is optional; interpreted, the scalar loop would be about twice as
+    slow as the numpy version.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return _wilder_rsi_seed_numpy
+    return njit(cache=True)(_wilder_rsi_seed_loop)
+
+class UpbitWebSocketWorker(QThread):
+    """
+    Streams ticker / trade events of one market so the trading loop does not poll them.
+    Readers only take snapshots of plain attributes, no locking needed.
+    """
+    TRADE_HISTORY = CHART_TICKS # same window as the REST tick chart
+    STALE_AFTER = 3.0 # seconds (a few trading loop intervals) without a ticker/trade frame before REST takes over
+    MAX_SILENT_TIMEOUTS = 2 # recv timeouts in a row without any frame, not even a pong: reconnect
+
+    def __init__(self, ticker):
+        super().__init__()
+        self.running = True
+        self.ticker = ticker
+        self.connected = False
+        self.latest_ticker = None # (trade_price, signed_change_rate, monotonic receive time) of the last ticker frame
+        self.trade_ticks = collections.deque(maxlen=self.TRADE_HISTORY)
+        self.trades_stamp = 0.0 # monotonic receive time of the last trade frame
+        self._ws = None
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Ends run() without waiting for the recv timeout or the reconnect delay."""
+        self.running = False
+        self._stop_event.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.abort() # wakes up the blocked recv()
+            except Exception:
+                pass
+
+    def set_ticker(self, ticker):
+        if ticker != self.ticker:
+            # run() notices the change, resubscribes and resets the buffers on its own thread
+            self.ticker = ticker
+            self.connected = False
+
+    def snapshot(self, ticker):
+        """Latest (price, change_rate) for ticker, or None if the stream can't provide a fresh one."""
+        latest = self.latest_ticker
+        if self.connected and self.ticker == ticker and latest is not None:
+            # A half-open socket or stalled feed keeps `connected`, the receive time does not lie
+            if time.monotonic() - latest[2] < self.STALE_AFTER:
+                return latest[:2]
+        return None
+
+    def trades(self, ticker):
+        """Last TRADE_HISTORY Ticks (oldest first), or None until the window is full or when it went stale."""
+        if self.connected and self.ticker == ticker and len(self.trade_ticks) == self.TRADE_HISTORY:
+            if time.monotonic() - self.trades_stamp < self.STALE_AFTER:
+                return tuple(self.trade_ticks)
+        return None
+
+    def run(self):
+        while self.running:
+            ticker = self.ticker
+            ws = None
+            try:
+                ws = websocket.create_connection(WS_URL, timeout=HTTP_TIMEOUT)
+                self._ws = ws
+                ws.send(json.dumps([
+                    {"ticket": "antigravity_bot"},
+                    {"type": "ticker", "codes": [ticker]},
+                    {"type": "trade", "codes": [ticker]},
+                ]))
+                # Only this thread writes the buffers, so nothing from the old market survives
+                self.latest_ticker = None
+                self.trade_ticks.clear()
+                self.connected = True
+                
+                silent = 0
+                while self.running and ticker == self.ticker:
+                    try:
+                        # control_frame=True also returns pongs, proof the socket is still alive
+                        opcode, frame = ws.recv_data(control_frame=True)
+                    except websocket.WebSocketTimeoutException:
+                        silent += 1
+                        if silent >= self.MAX_SILENT_TIMEOUTS:
+                            # Not even the pong came back: half-open socket, reconnect.
+                            # shutdown() drops it without waiting for a close handshake
+                            ws.shutdown()
+                            break
+                        # Quiet market: keep the connection alive
+                        ws.ping()
+                        continue
+                    silent = 0
+                    if opcode == websocket.ABNF.OPCODE_CLOSE:
+                        break
+                    if opcode not in (websocket.ABNF.OPCODE_TEXT, websocket.ABNF.OPCODE_BINARY):
+                        continue
+                        
+                    data = orjson.loads(frame)
+                    if data.get('code') != self.ticker:
+                        continue
+                    if data.get('type') == "ticker":
+                        self.latest_ticker = (float(data['trade_price']), float(data['signed_change_rate']), time.monotonic())
+                    elif data.get('type') == "trade":
+                        self.trade_ticks.append(Tick(data['sequential_id'], float(data['trade_price'])))
+                        self.trades_stamp = time.monotonic()
+            except Exception:
+                # Connection lost, the trading loop falls back to REST meanwhile
+                self.connected = False
+                self._stop_event.wait(1.0)
+            finally:
+                self.connected = False
+                self._ws = None
+                if ws is not None:
+                    try:
+                        ws.close()
+                    except Exception:
+                        pass
 
 class RSIWorker(QThread):
     """
@@ -29,9 +225,15 @@ class RSIWorker(QThread):
     log_signal = pyqtSignal(str)
     # price, rsi, profit_rate, total_asset, signed_change_rate
     status_signal = pyqtSignal(float, float, float, float, float) 
-    data_signal = pyqtSignal(pd.DataFrame) # New signal for Chart Data
+    data_signal = pyqtSignal(str, object) # ticker, tuple of new Ticks for the chart (oldest first)
     msg_signal = pyqtSignal(str) # Detailed status message
 
+    LOOP_INTERVAL = 1.0 # seconds per polling iteration
+    BALANCE_TTL = 5.0 # seconds between account balance refreshes
+    CHART_EMIT_INTERVAL = 0.25 # max 4 chart updates per second
+    TICK_FETCH_INTERVAL = 2.0 # seconds between trade tick fetches for the chart
+    CHART_SEEN = 4 * CHART_TICKS # sequential_ids remembered to skip trades already charted
+
     def __init__(self):
         super().__init__()
         self.running = True  # Thread life cycle
@@ -48,7 +250,19 @@ class RSIWorker(QThread):
         self.access_key = ""
         self.secret_key = ""
         
-        self.upbit = None
+        self.upbit = None # created by _upbit_client() on first use
+        self._upbit_keys = None # (access, secret) the client should use
+        self._upbit_client_keys = None # keys self.upbit was created with
+        
+        # Keep-alive session so TCP/TLS is reused across loop iterations
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        self.http.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=3)
+        self._stop_event = threading.Event() # set by stop(), cuts the loop sleep short
+        
+        # Pushed ticker/trade events, REST is only the fallback
+        self.stream = UpbitWebSocketWorker(self.ticker)
         
         # Simulation Wallet
         self.sim_balance_krw = 10000000.0 # 10 Million KRW virtual
@@ -63,10 +277,28 @@ class RSIWorker(QThread):
         self.loss_count = 0
         self.max_loss_count = 0 # 0 means disabled, set via settings
         self.cooldown_minutes = 30
-        self.cooldown_end_time = None
+        self.cooldown_end_monotonic = None # time.monotonic() deadline, unaffected by clock changes
+        
+        # Incremental Wilder RSI state (averages up to the last closed candle)
+        self._rsi_state = {'avg_gain': None, 'avg_loss': None, 'prev_close': None, 'ticker': None, 'candle_ts': None, 'rsi': math.nan}
+        # Ring buffer of closed candle closes for that ticker, reseeding needs no HTTP
+        self._close_ring = np.empty(256, dtype=np.float64)
+        self._close_head = 0 # total closes written, next slot is head % size
+        self._close_len = 0
+        
+        # Real account snapshot, refreshed at most every BALANCE_TTL seconds
+        self._bal_cache = {'ts': 0, 'krw': 0, 'coin': 0, 'avg': 0, 'ticker': None}
+        
+        self._last_chart_emit = 0.0
+        self._chart_ticker = None # ticker / sequential_ids recently sent to the chart
+        self._chart_sent = collections.deque(maxlen=self.CHART_SEEN)
+        self._chart_seen = set() # same ids as _chart_sent, for the lookups
+        self.chart_active = True # False while the window is hidden/minimized
+        self._next_tick_fetch = 0.0
 
     def update_settings(self, ticker, rsi_entry, roi_target, roi_stop, amount, access, secret, simulation, max_loss, cooldown):
         self.ticker = ticker
+        self.stream.set_ticker(ticker)
         self.rsi_entry = rsi_entry
         self.roi_target = roi_target
         self.roi_stop = roi_stop
@@ -79,65 +311,96 @@ class RSIWorker(QThread):
         self.cooldown_minutes = cooldown
         
         if not self.simulation_mode and self.access_key and self.secret_key:
-            self.upbit = pyupbit.Upbit(self.access_key, self.secret_key)
+            # Only remember the keys: building the client imports pyupbit/pandas,
+            # which must not happen on the GUI thread before the window shows
+            self._upbit_keys = (self.access_key, self.secret_key)
+            self._bal_cache['ts'] = 0
 
     def run(self):
-        self.log_signal.emit(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] Trading Thread Started.")
+        self.log_signal.emit(f"[{time.strftime('%H:%M:%S')}] Trading Thread Started.")
         
-        while self.running:
+        self.stream.start()
+        
+        next_deadline = time.monotonic() + self.LOOP_INTERVAL
+        while self.running and not self.isInterruptionRequested():
             try:
                 # Initialize variables to defaults or previous values to prevent '0' or UnboundLocalError
                 current_price = 0.0
-                rsi = 0.0
+                rsi = math.nan # NaN = no RSI yet, never read as oversold
                 profit_rate = 0.0
                 total_asset = 0.0
                 signed_change_rate = 0.0
                 
                 # 1. Fetch Price & RSI
+                # Public endpoints are requested concurrently: one RTT per tick instead of three
+                # Ticker and trades come from the WebSocket stream while it is connected
+                stream_ticker = self.stream.snapshot(self.ticker)
+                stream_trades = self.stream.trades(self.ticker)
+                
+                # Full history only to seed the RSI, afterwards the last 2 candles are enough
+                rsi_ticker = self.ticker
+                count = 2 if self._rsi_state['ticker'] == rsi_ticker else 200
+                f_ticker = None
+                if stream_ticker is None:
+                    f_ticker = self._pool.submit(self.http.get, TICKER_URL, params={"markets": self.ticker}, timeout=HTTP_TIMEOUT)
+                f_candles = self._pool.submit(self.http.get, CANDLES_URL, params={"market": rsi_ticker, "count": count}, timeout=HTTP_TIMEOUT)
+                
+                # Tick data for Chart (only while visible, it does not need 1 Hz)
+                f_trades = None
+                trades_ticker = self.ticker
+                if self.chart_active and stream_trades is None and time.monotonic() >= self._next_tick_fetch:
+                    self._next_tick_fetch = time.monotonic() + self.TICK_FETCH_INTERVAL
+                    # Direct API call since pyupbit might lack this specific wrapper or naming differs
+                    f_trades = self._pool.submit(self.http.get, TRADES_URL, params={"market": trades_ticker, "count": CHART_TICKS}, timeout=HTTP_TIMEOUT)
+                
                 # Fetch minute candles for RSI
                 try:
-                    # Use direct API call for robustness
-                    url = "https://api.upbit.com/v1/ticker"
-                    resp = requests.get(url, params={"markets": self.ticker})
-                    
-                    if resp.status_code == 200:
-                        data = resp.json()[0]
-                        current_price = float(data['trade_price'])
-                        signed_change_rate = float(data['signed_change_rate']) 
+                    if stream_ticker is not None:
+                        current_price, signed_change_rate = stream_ticker
                     else:
-                        # Fallback
-                        cp = pyupbit.get_current_price(self.ticker)
-                        if cp is not None:
-                            current_price = float(cp)
+                        # Use direct API call for robustness
+                        resp = self._result(f_ticker)
+                        
+                        if resp.status_code == 200:
+                            data = orjson.loads(resp.content)[0]
+                            current_price = float(data['trade_price'])
+                            signed_change_rate = float(data['signed_change_rate']) 
+                        else:
+                            # Fallback
+                            cp = _pyupbit().get_current_price(self.ticker)
+                            if cp is not None:
+                                current_price = float(cp)
 
-                    df_candle = pyupbit.get_ohlcv(self.ticker, interval="minute1", count=200) 
-                    if df_candle is not None:
+                    resp = self._result(f_candles)
+                    if resp.status_code == 200:
+                        candles = orjson.loads(resp.content)
+                        # Upbit returns newest first, reverse to oldest first
+                        closes = np.fromiter((c['trade_price'] for c in candles), dtype=np.float64, count=len(candles))[::-1]
+                        stamps = [c['candle_date_time_utc'] for c in reversed(candles)]
                         # Do NOT overwrite current_price with candle close, ticker is more current
-                        rsi = self._calculate_rsi_from_df(df_candle)
+                        rsi = self._calculate_rsi(closes, stamps, rsi_ticker)
                     else:
-                        rsi = 0.0
                         self.log_signal.emit(f"⚠️ 캔들 데이터 조회 실패: {self.ticker}")
+                except InterruptedError:
+                    raise # stop() during the request, not an API error
                 except Exception as e:
                     self.log_signal.emit(f"⚠️ 캔들 API 오류: {e}")
 
                 # 2. Calculate Asset & Profit
+                # (krw, coin, avg_buy_price) snapshot, shared with the trading logic below
+                wallet = None
                 if self.simulation_mode:
+                    wallet = (self.sim_balance_krw, self.sim_balance_coin, self.sim_avg_buy_price)
                     if self.sim_balance_coin > 0:
                         profit_rate = (current_price - self.sim_avg_buy_price) / self.sim_avg_buy_price * 100
                     total_asset = self.sim_balance_krw + (self.sim_balance_coin * current_price)
-                elif self.upbit:
+                elif self._upbit_client():
                     try:
-                         balance = self.upbit.get_balance(self.ticker)
-                         if balance is None: balance = 0
-                         
-                         avg_buy_price = self.upbit.get_avg_buy_price(self.ticker)
-                         if avg_buy_price is None or avg_buy_price == 0:
-                             profit_rate = 0.0
-                         else:
-                             if current_price > 0:
-                                 profit_rate = ((current_price - avg_buy_price) / avg_buy_price) * 100
-                             
-                         total_asset = float(self.upbit.get_balance("KRW") or 0) + (balance * current_price)
+                        bal = self._refresh_balances()
+                        wallet = (bal['krw'], bal['coin'], bal['avg'])
+                        if bal['avg'] > 0 and current_price > 0:
+                            profit_rate = ((current_price - bal['avg']) / bal['avg']) * 100
+                        total_asset = bal['krw'] + (bal['coin'] * current_price)
                     except Exception as e:
                         self.log_signal.emit(f"⚠️ 잔고/수익률 조회 실패: {e}")
                 
@@ -145,127 +408,247 @@ class RSIWorker(QThread):
                 if current_price > 0:
                     self.status_signal.emit(current_price, rsi, profit_rate, total_asset, signed_change_rate)
                 
-                # Fetch Tick data for Chart
-                try:
-                    # Direct API call since pyupbit might lack this specific wrapper or naming differs
-                    url = "https://api.upbit.com/v1/trades/ticks"
-                    params = {"market": self.ticker, "count": 50}
-                    response = requests.get(url, params=params)
+                # Tick data for Chart
+                if self.chart_active and stream_trades is not None:
+                    self._emit_chart(self.ticker, stream_trades)
+                elif f_trades is not None:
+                    try:
+                        response = self._result(f_trades)
                     
-                    if response.status_code == 200:
-                        ticks = response.json()
-                        if ticks:
-                            df_tick = pd.DataFrame(ticks)
-                            # Data: trade_price, trade_volume, trade_timestamp, etc.
-                            # Reverse to have oldest first
-                            df_tick = df_tick.iloc[::-1]  
-                            self.data_signal.emit(df_tick)
-                    else:
-                        pass
-                except Exception as e:
-                    self.log_signal.emit(f"⚠️ 체결 API 오류: {e}")
+                        if response.status_code == 200:
+                            ticks = orjson.loads(response.content)
+                            if ticks:
+                                # The chart only needs trade_price. Reverse to have oldest first
+                                self._emit_chart(trades_ticker, tuple(Tick(t['sequential_id'], float(t['trade_price'])) for t in reversed(ticks)))
+                    except InterruptedError:
+                        raise
+                    except Exception as e:
+                        self.log_signal.emit(f"⚠️ 체결 API 오류: {e}")
 
-                # 2. Calculate Profit
-                profit_rate = 0.0
-                if self.simulation_mode:
-                    if self.sim_balance_coin > 0:
-                        profit_rate = (current_price - self.sim_avg_buy_price) / self.sim_avg_buy_price * 100
-                elif self.upbit:
-                    try:
-                        avg_price = self.upbit.get_avg_buy_price(self.ticker)
-                        if avg_price > 0:
-                            profit_rate = (current_price - avg_price) / avg_price * 100
-                    except:
-                        pass 
-                
-                # Mocking profit calculation for display if we don't have real connection or assets yet
-                # In a real bot, we would query self.upbit.get_balance(self.ticker) 
-                # But to avoid rate limits in this loop, we do it sparingly or catch errors.
-                
-                # Report Status to GUI
-                if current_price:
-                    # Calculate Total Asset
-                    total_asset = 0.0
-                    if self.simulation_mode:
-                        total_asset = self.sim_balance_krw + (self.sim_balance_coin * current_price)
-                    elif self.upbit:
-                        try:
-                            krw = self.upbit.get_balance("KRW")
-                            coin = self.upbit.get_balance(self.ticker)
-                            total_asset = krw + (coin * current_price)
-                        except:
-                            pass
-                            
-                    self.status_signal.emit(current_price, rsi, profit_rate, total_asset, signed_change_rate)
-                
                 # 3. Auto Trading Logic
-                if self.auto_active:
-                    # Check Cooldown
-                    if self.cooldown_end_time:
-                        if datetime.datetime.now() < self.cooldown_end_time:
-                            remain = self.cooldown_end_time - datetime.datetime.now()
-                            # Format mm:ss
-                            mm, ss = divmod(remain.seconds, 60)
-                            msg = f"🧊 과열 방지(연속 손절): {mm}분 {ss}초 후 재개"
-                            self.msg_signal.emit(msg)
-                            time.sleep(1)
-                            continue
-                        else:
-                            self.cooldown_end_time = None
-                            self.loss_count = 0
-                            self.msg_signal.emit("🔥 쿨타임 종료! 매매를 재개합니다.")
-
-                    # Run if Upbit is connected OR if we are in Simulation Mode
-                    if self.upbit or self.simulation_mode:
-                        self._process_auto_trading(current_price, rsi)
-                    elif not self.simulation_mode and not self.upbit:
-                        pass
+                if self.auto_active and not self._in_cooldown():
+                    # Run if Upbit is connected OR if we are in Simulation Mode, and the balances are known
+                    if wallet is not None and current_price > 0:
+                        self._process_auto_trading(current_price, rsi, *wallet)
 
             except Exception as e:
                 # self.log_signal.emit(f"Error: {str(e)}")
                 # Don't spam logs on transient network errors
                 pass
 
-            time.sleep(1) # Interval
-
-    def _calculate_rsi_from_df(self, df):
-        try:
-            delta = df['close'].diff(1)
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
+            # Interval: keep a steady cadence regardless of how long the iteration took
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                next_deadline = time.monotonic()
+            next_deadline += self.LOOP_INTERVAL
             
-            avg_gain = gain.rolling(window=14, min_periods=14).mean()
-            avg_loss = loss.rolling(window=14, min_periods=14).mean()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.stream.stop()
+        self.stream.wait(2000)
+
+    def stop(self):
+        """Asks run() to finish: wakes the loop sleep and the stream."""
+        self.running = False
+        self.requestInterruption()
+        self._stop_event.set()
+        self.stream.stop()
+
+    def _result(self, future):
+        # Wait in short slices so stop() does not have to sit out a slow HTTP request
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except FutureTimeout:
+                if self.isInterruptionRequested():
+                    raise InterruptedError("worker stopping")
+
+    def _emit_chart(self, ticker, ticks):
+        # Drop emissions the GUI could not redraw in time anyway,
+        # the skipped trades are not marked as sent and go out with the next one
+        now = time.monotonic()
+        if now - self._last_chart_emit <= self.CHART_EMIT_INTERVAL:
+            return
+        if ticker != self._chart_ticker:
+            self._chart_ticker = ticker
+            self._chart_sent.clear()
+            self._chart_seen.clear()
             
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi.iloc[-1]
+        # Only trades the chart has not seen yet cross the thread boundary.
+        # sequential_id is unique but not ordered, so it is only compared for identity
+        new = tuple(t for t in ticks if t.seq not in self._chart_seen)
+        if new:
+            self.data_signal.emit(ticker, new)
+            for t in new:
+                if len(self._chart_sent) == self.CHART_SEEN:
+                    self._chart_seen.discard(self._chart_sent[0])
+                self._chart_sent.append(t.seq)
+                self._chart_seen.add(t.seq)
+            self._last_chart_emit = now
+
+    def _in_cooldown(self):
+        # Check Cooldown
+        if self.cooldown_end_monotonic:
+            remain = self.cooldown_end_monotonic - time.monotonic()
+            if remain > 0:
+                # Format mm:ss
+                mm, ss = divmod(int(remain), 60)
+                msg = f"🧊 과열 방지(연속 손절): {mm}분 {ss}초 후 재개"
+                self.msg_signal.emit(msg)
+                return True
+            else:
+                self.cooldown_end_monotonic = None
+                self.loss_count = 0
+                self.msg_signal.emit("🔥 쿨타임 종료! 매매를 재개합니다.")
+        return False
+
+    def set_chart_active(self, active):
+        self.chart_active = active
+        if active:
+            # Refresh the chart right away when it becomes visible again
+            self._next_tick_fetch = 0.0
+
+    def _upbit_client(self):
+        """Upbit client for the configured keys (None without keys), created lazily."""
+        keys = self._upbit_keys
+        if keys is not None and keys != self._upbit_client_keys:
+            self.upbit = _pyupbit().Upbit(*keys)
+            self._upbit_client_keys = keys
+        return self.upbit
+
+    def _refresh_balances(self, force=False):
+        """
+        Fetch KRW / coin balance and average buy price with a single get_balances() call.
+        """
+        cache = self._bal_cache
+        now = time.monotonic()
+        if not force and cache['ticker'] == self.ticker and now - cache['ts'] < self.BALANCE_TTL:
+            return cache
+
+        balances = self.upbit.get_balances()
+        if not isinstance(balances, list):
+            raise RuntimeError(f"잔고 조회 실패: {balances}")
+
+        currency = self.ticker.split("-")[-1]
+        krw = coin = avg = 0.0
+        for b in balances:
+            if b['currency'] == "KRW":
+                krw = float(b['balance'])
+            elif b['currency'] == currency:
+                coin = float(b['balance'])
+                avg = float(b['avg_buy_price'])
+
+        cache.update(ts=now, krw=krw, coin=coin, avg=avg, ticker=self.ticker)
+        return cache
+
+    def _apply_fill(self, krw, coin, avg):
+        # Infer the wallet after a market order instead of re-querying right away,
+        # the exchange may not have settled it yet. The next TTL refresh reconciles.
+        self._bal_cache.update(ts=time.monotonic(), krw=krw, coin=coin, avg=avg, ticker=self.ticker)
+
+    def _calculate_rsi(self, closes, stamps, ticker):
+        """
+        Wilder's RSI, updated incrementally from minute candle closes (oldest first).
+        Smoothed averages are kept for closed candles only; the still-forming
+        candle is applied provisionally on every tick without being committed.
+        Returns NaN while there is not enough history for an RSI.
+        """
+        try:
+            state = self._rsi_state
+            if len(closes) == 0 or ticker != self.ticker:
+                # Ticker changed while the candles were in flight
+                return math.nan
+
+            if state['ticker'] != ticker or state['avg_gain'] is None:
+                # Fresh history: refill the ring with the closed candles
+                keep = min(len(closes) - 1, self._close_ring.size)
+                self._close_ring[:keep] = closes[len(closes) - 1 - keep:-1]
+                self._close_head = self._close_len = keep
+                return self._seed_rsi(closes[-1], stamps[-1], ticker)
+
+            if stamps[-1] < state['candle_ts']:
+                # Lagging / out-of-order reply (ISO UTC stamps sort as strings): already committed
+                return state['rsi']
+            if stamps[-1] != state['candle_ts']:
+                if len(closes) < 2:
+                    return state['rsi']
+                self._push_close(closes[-2])
+                if stamps[-2] != state['candle_ts']:
+                    # Missed candles in between: reseed from the ring instead of refetching,
+                    # the gap counts as a single step
+                    return self._seed_rsi(closes[-1], stamps[-1], ticker)
+                # The tracked candle has closed: commit its final close
+                state['avg_gain'], state['avg_loss'] = self._wilder_step(state, closes[-2])
+                state['prev_close'] = closes[-2]
+                state['candle_ts'] = stamps[-1]
+
+            return self._live_rsi(closes[-1])
         except:
-            return 0.0
+            return math.nan
+
+    def _push_close(self, close):
+        self._close_ring[self._close_head % self._close_ring.size] = close
+        self._close_head += 1
+        self._close_len = min(self._close_len + 1, self._close_ring.size)
+
+    def _ring_closes(self):
+        # Ring contents in logical order, oldest first
+        idx = np.arange(self._close_head - self._close_len, self._close_head) % self._close_ring.size
+        return self._close_ring[idx]
+
+    def _seed_rsi(self, live_close, candle_ts, ticker):
+        state = self._rsi_state
+        n = self.rsi_period
+        closes = self._ring_closes()
+        if closes.size <= n:
+            # Not enough closed candles yet (freshly listed market)
+            state['ticker'] = None
+            state['rsi'] = math.nan
+            return math.nan
 
-    # Old method removed/replaced logic above, keeping signature if needed or just removing it.
-    # def _calculate_rsi(self, ticker, interval="minute1", count=200): ...
+        avg_gain, avg_loss = _wilder_rsi_seed()(closes, n)
+        state['avg_gain'] = float(avg_gain)
+        state['avg_loss'] = float(avg_loss)
+        state['prev_close'] = float(closes[-1])
+        state['candle_ts'] = candle_ts
+        state['ticker'] = ticker
+        return self._live_rsi(live_close)
 
-    def _process_auto_trading(self, current_price, rsi):
+    def _wilder_step(self, state, close):
+        n = self.rsi_period
+        delta = close - state['prev_close']
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain = (state['avg_gain'] * (n - 1) + gain) / n
+        avg_loss = (state['avg_loss'] * (n - 1) + loss) / n
+        return avg_gain, avg_loss
+
+    def _live_rsi(self, close):
+        avg_gain, avg_loss = self._wilder_step(self._rsi_state, float(close))
+        if avg_loss == 0:
+            rsi = 100.0 if avg_gain > 0 else 50.0
+        else:
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        self._rsi_state['rsi'] = rsi
+        return rsi
+
+    def _process_auto_trading(self, current_price, rsi, krw_balance, coin_balance, avg_buy_price):
         try:
-            # 0. Check Balance
+            # 0. Check Balance (snapshot taken by run() for this tick)
             if self.simulation_mode:
-                krw_balance = self.sim_balance_krw
-                coin_balance = self.sim_balance_coin
-                avg_buy_price = self.sim_avg_buy_price
                 is_holding = coin_balance > 0
             else:
-                krw_balance = self.upbit.get_balance("KRW")
-                coin_balance = self.upbit.get_balance(self.ticker)
-                avg_buy_price = self.upbit.get_avg_buy_price(self.ticker)
-                
                 # Use a threshold to determine if we are holding the coin (e.g. > 5000 KRW value)
                 current_value = coin_balance * current_price
                 is_holding = current_value >= 5000
 
             # 1. Buy Logic (If not holding)
             if not is_holding:
-                if rsi <= self.rsi_entry:
+                if not math.isfinite(rsi):
+                    # No RSI yet (short history, candle fetch failed): never an entry signal
+                    self.msg_signal.emit("⏳ RSI 계산 대기중 (캔들 데이터 부족)")
+                elif rsi <= self.rsi_entry:
                     if krw_balance >= self.amount:
                         if self.simulation_mode:
                             buy_amt = self.amount / current_price
@@ -274,10 +657,17 @@ class RSIWorker(QThread):
                             self.sim_avg_buy_price = current_price
                             self.log_signal.emit(f"🧪 [SIM] 매수: {current_price} 원 (수량: {buy_amt:.8f})")
                         else:
-                            self.upbit.buy_market_order(self.ticker, self.amount)
-                            self.log_signal.emit(f"🚀 실전 매수 체결: RSI {rsi:.1f} <= {self.rsi_entry}")
+                            resp = self.upbit.buy_market_order(self.ticker, self.amount)
+                            if isinstance(resp, dict) and 'uuid' in resp:
+                                self._apply_fill(krw_balance - self.amount, coin_balance + self.amount / current_price, current_price)
+                                self.log_signal.emit(f"🚀 실전 매수 체결: RSI {rsi:.1f} <= {self.rsi_entry}")
+                            else:
+                                # Rejected: don't guess the wallet, re-read it on the next tick
+                                self._bal_cache['ts'] = 0
+                                self.log_signal.emit(f"⚠️ 매수 주문 실패: {resp}")
                         
-                        time.sleep(2)
+                        if self._stop_event.wait(2):
+                            return # stop() during the pause after the order
                     else:
                         self.msg_signal.emit("⚠️ 잔고 부족 (KRW)")
                 else:
@@ -312,6 +702,7 @@ class RSIWorker(QThread):
                         
                         
                     if sell_signal:
+                        sold = True
                         if self.simulation_mode:
                             amount_sold_krw = coin_balance * current_price
                             self.sim_balance_krw += amount_sold_krw
@@ -319,36 +710,45 @@ class RSIWorker(QThread):
                             self.sim_avg_buy_price = 0
                             self.log_signal.emit(f"🧪 [SIM] 매도 체결: {reason}")
                         else:
-                            self.upbit.sell_market_order(self.ticker, coin_balance)
-                            self.log_signal.emit(reason)
+                            resp = self.upbit.sell_market_order(self.ticker, coin_balance)
+                            if isinstance(resp, dict) and 'uuid' in resp:
+                                self._apply_fill(krw_balance + coin_balance * current_price, 0.0, 0.0)
+                                self.log_signal.emit(reason)
+                            else:
+                                # Position is still open: re-read the wallet next tick, no loss counted
+                                sold = False
+                                self._bal_cache['ts'] = 0
+                                self.log_signal.emit(f"⚠️ 매도 주문 실패: {resp}")
                         
                         # Update Consecutive Loss Logic
-                        if profit_rate <= self.roi_stop:
-                            self.loss_count += 1
-                            self.log_signal.emit(f"⚠️ 연속 손절 {self.loss_count}회 누적 (제한: {self.max_loss_count}회)")
+                        if sold:
+                            if profit_rate <= self.roi_stop:
+                                self.loss_count += 1
+                                self.log_signal.emit(f"⚠️ 연속 손절 {self.loss_count}회 누적 (제한: {self.max_loss_count}회)")
                             
-                            if self.max_loss_count > 0 and self.loss_count >= self.max_loss_count:
-                                self.cooldown_end_time = datetime.datetime.now() + datetime.timedelta(minutes=self.cooldown_minutes)
-                                self.log_signal.emit(f"🥶 손절 제한 도달! {self.cooldown_minutes}분간 매매를 중단합니다.")
-                        else:
-                             # Reset on Profit
-                             if self.loss_count > 0:
-                                 self.log_signal.emit(f"🍀 익절 성공! 연속 손절 카운트 초기화.")
-                             self.loss_count = 0
+                                if self.max_loss_count > 0 and self.loss_count >= self.max_loss_count:
+                                    self.cooldown_end_monotonic = time.monotonic() + self.cooldown_minutes * 60
+                                    self.log_signal.emit(f"🥶 손절 제한 도달! {self.cooldown_minutes}분간 매매를 중단합니다.")
+                            else:
+                                 # Reset on Profit
+                                 if self.loss_count > 0:
+                                     self.log_signal.emit(f"🍀 익절 성공! 연속 손절 카운트 초기화.")
+                                 self.loss_count = 0
                              
-                        time.sleep(2)
+                        if self._stop_event.wait(2):
+                            return # stop() during the pause after the order
                     
         except Exception as e:
             self.log_signal.emit(f"오류 발생: {str(e)}")
 
     def buy_now(self):
-        self.log_signal.emit(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] 🚨 수동 매수 시도 (Market Price)")
+        self.log_signal.emit(f"[{time.strftime('%H:%M:%S')}] 🚨 수동 매수 시도 (Market Price)")
         
         try:
             # 1. Simulation Mode
             if self.simulation_mode:
                  # Fetch current price first
-                 current_price = pyupbit.get_current_price(self.ticker)
+                 current_price = _pyupbit().get_current_price(self.ticker)
                  if current_price:
                      buy_amt = self.amount / current_price
                      self.sim_balance_coin += buy_amt
@@ -359,13 +759,14 @@ class RSIWorker(QThread):
                      self.log_signal.emit("⚠️ 가격 조회 실패")
             
             # 2. Real Trading
-            elif self.upbit:
+            elif self._upbit_client():
                 balance = self.upbit.get_balance("KRW")
                 if balance < self.amount:
                     self.log_signal.emit("⚠️ 원화 잔고 부족")
                     return
                     
                 resp = self.upbit.buy_market_order(self.ticker, self.amount)
+                self._bal_cache['ts'] = 0
                 if isinstance(resp, dict) and 'uuid' in resp:
                     self.log_signal.emit("🚀 실전 수동 매수 주문 완료")
                 else:
@@ -377,12 +778,12 @@ class RSIWorker(QThread):
             self.log_signal.emit(f"매수 오류: {str(e)}")
 
     def sell_all(self):
-        self.log_signal.emit(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] 🚨 비상 전량 매도 (Panic Sell)!")
+        self.log_signal.emit(f"[{time.strftime('%H:%M:%S')}] 🚨 비상 전량 매도 (Panic Sell)!")
         
         try:
             # 1. Simulation Mode
             if self.simulation_mode:
-                current_price = pyupbit.get_current_price(self.ticker)
+                current_price = _pyupbit().get_current_price(self.ticker)
                 if current_price:
                     amount_sold_krw = self.sim_balance_coin * current_price
                     self.sim_balance_krw += amount_sold_krw
@@ -391,11 +792,12 @@ class RSIWorker(QThread):
                     self.log_signal.emit(f"🧪 [SIM] 전량 매도 완료 (평가금: {amount_sold_krw:,.0f} 원)")
             
             # 2. Real Trading
-            elif self.upbit:
+            elif self._upbit_client():
                 balance = self.upbit.get_balance(self.ticker)
                 if balance and balance > 0:
                     # Minimum order rule check done by Upbit API usually, but good to note
                     resp = self.upbit.sell_market_order(self.ticker, balance)
+                    self._bal_cache['ts'] = 0
                     if isinstance(resp, dict) and 'uuid' in resp:
                         self.log_signal.emit("📉 실전 전량 매도 주문 완료")
                     else:
@@ -408,12 +810,173 @@ class RSIWorker(QThread):
         except Exception as e:
              self.log_signal.emit(f"매도 오류: {str(e)}")
 
+class MarketListWorker(QThread):
+    """
+    Fetches the KRW market list off the GUI thread so the window shows immediately.
+    The result is cached on disk, the list changes only a few times a day.
+    """
+    markets_ready = pyqtSignal(list) # [(display, code), ...], empty if the fetch failed
+
+    CACHE_PATH = os.path.join(tempfile.gettempdir(), "upbit_markets.json")
+    CACHE_TTL = 6 * 3600 # seconds
+    FETCH_ATTEMPTS = 3
+    RETRY_DELAY = 2.0 # seconds before the second attempt, doubled after that
+
+    def __init__(self):
+        super().__init__()
+        self._stop_event = threading.Event()
+
+    @classmethod
+    def load_cache(cls):
+        """Returns (items, is_fresh). items is empty if there is no usable cache."""
+        try:
+            with open(cls.CACHE_PATH, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            items = [(display, code) for display, code in cache['items']]
+            return items, time.time() - cache['ts'] < cls.CACHE_TTL
+        except Exception:
+            return [], False
+
+    @classmethod
+    def save_cache(cls, items):
+        try:
+            with open(cls.CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump({"ts": time.time(), "items": items}, f, ensure_ascii=False)
+        except Exception:
+            pass
+
+    def stop(self):
+        """Abandons the fetch. Nothing here needs persisting, so closing never waits for it."""
+        self.requestInterruption()
+        self._stop_event.set()
+
+    def run(self):
+        delay = self.RETRY_DELAY
+        for attempt in range(self.FETCH_ATTEMPTS):
+            items = self._fetch()
+            if items or attempt == self.FETCH_ATTEMPTS - 1 or self._stop_event.wait(delay):
+                break
+            delay *= 2
+
+        if self.isInterruptionRequested():
+            return
+        if items:
+            self.save_cache(items)
+        self.markets_ready.emit(items or [])
+
+    def _fetch(self):
+        try:
+            # Fetch all markets with details
+            resp = requests.get(MARKETS_URL, timeout=HTTP_TIMEOUT)
+            if resp.status_code == 200:
+                markets = orjson.loads(resp.content)
+                krw_markets = [m for m in markets if m['market'].startswith("KRW-")]
+                
+                items = []
+                for m in krw_markets:
+                    name = f"{m['korean_name']} ({m['market']})"
+                    items.append((name, m['market']))
+            elif not self.isInterruptionRequested():
+                # pyupbit sets no HTTP timeout, not worth it while the window is closing
+                items = [(code, code) for code in _pyupbit().get_tickers(fiat="KRW")]
+            else:
+                items = None
+        except:
+            items = None
+        return items
+
+class SettingsWriterWorker(QThread):
+    """
+    Writes config.json off the GUI thread.
+    The queue holds at most one pending snapshot, a newer one replaces it,
+    so a burst of setting changes ends in a single disk write.
+    """
+    write_done = pyqtSignal(object, str) # settings hash, error message ("" on success)
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._slot = queue.Queue(maxsize=1)
+
+    def submit(self, data, settings_hash):
+        """Queue serialized settings, dropping a snapshot that was not written yet."""
+        while True:
+            try:
+                self._slot.put_nowait((data, settings_hash))
+                return
+            except queue.Full:
+                try:
+                    self._slot.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def stop(self):
+        """Finish the pending write, then end the thread. Call wait() afterwards."""
+        self._slot.put(None)
+
+    def run(self):
+        while True:
+            item = self._slot.get()
+            if item is None:
+                break
+            data, settings_hash = item
+            try:
+                # Write to a temp file and rename, a crash mid-write can't corrupt config.json
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                # mtime resolution can be coarse, don't trust the key alone
+                _load_config.cache_clear()
+                self.write_done.emit(settings_hash, "")
+            except Exception as e:
+                self.write_done.emit(settings_hash, str(e))
+
+class TickerCompleter(QCompleter):
+    """
+    Substring completer over a lowercase index built once per market list,
+    instead of Qt case-folding every item on each keystroke.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._lower = []
+        self._matches = QStringListModel(self)
+        self.setModel(self._matches)
+        # Filtering happens in splitPath, the popup shows the model as is
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        
+    def set_items(self, items):
+        self._items = list(items)
+        self._lower = [s.lower() for s in self._items]
+        
+    def splitPath(self, path):
+        query = path.lower()
+        self._matches.setStringList([item for item, low in zip(self._items, self._lower) if query in low])
+        return [""]
+
 class ChartWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
         
+        # Rolling window fed by append_ticks, drawn by redraw at most once per timer tick
+        self.ticker = None
+        self.prices = collections.deque(maxlen=CHART_TICKS)
+        self._dirty = False
+        self.canvas = None # created by build_plot()
+        
+    def build_plot(self):
+        """Creates the matplotlib figure. Called after the window is shown, the backend import is slow."""
+        if self.canvas is not None:
+            return
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        font_prop = _load_chart_font()
+        
         self.figure = Figure(figsize=(5, 4), dpi=100)
         self.figure.patch.set_facecolor('#353535') # Match theme
         self.canvas = FigureCanvas(self.figure)
@@ -423,41 +986,182 @@ class ChartWidget(QWidget):
         self.ax1.set_facecolor('#252525')
         self.ax1.tick_params(axis='x', colors='white')
         self.ax1.tick_params(axis='y', colors='white')
+        self.ax1.set_title(f"실시간 체결 차트 ({CHART_TICKS} Tick)", color='white', fontproperties=font_prop)
+        self.ax1.grid(True, color='#444')
         
-    def update_chart(self, df):
-        self.ax1.clear()
-        if df is None or df.empty:
+        # The x-axis is a fixed tick index, allocate it once and skip autoscaling
+        self._x = np.arange(CHART_TICKS)
+        self.ax1.set_xlim(0, CHART_TICKS - 1)
+        self.ax1.set_autoscale_on(False)
+        self.figure.tight_layout()
+        
+        # The line is animated: full draws render only the static background,
+        # ticks are blitted on top of the cached background
+        self.line, = self.ax1.plot([], [], color='#4CAF50', label='Price', animated=True)
+        self.background = None
+        self._x_hi = CHART_TICKS - 1
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        # Ticks received before the plot existed
+        self._dirty = bool(self.prices)
+        
+    def _on_draw(self, event):
+        # Re-cache after every full draw (resize, axis limits changed)
+        self.background = self.canvas.copy_from_bbox(self.ax1.bbox)
+        self.ax1.draw_artist(self.line)
+        
+    def append_ticks(self, ticker, ticks):
+        if ticker != self.ticker:
+            # Market changed, the old window is meaningless
+            self.ticker = ticker
+            self.prices.clear()
+        self.prices.extend(t.price for t in ticks)
+        self._dirty = True
+        
+    def redraw(self):
+        if not self._dirty or self.canvas is None:
+            return
+        self._dirty = False
+        self.update_chart(np.fromiter(self.prices, dtype=np.float64, count=len(self.prices)))
+        
+    def update_chart(self, prices):
+        if prices is None or prices.size == 0:
             return
 
-        # Tick data has 'trade_price'
-        if 'trade_price' in df.columns:
-            prices = df['trade_price']
-            # Using simple index for x-axis in tick chart as timestamps are irregular
-            x_vals = range(len(prices))
-            self.ax1.plot(x_vals, prices, color='#4CAF50', label='Price')
-            self.ax1.set_title("실시간 체결 차트 (50 Tick)", color='white', fontproperties=font_prop)
-        else:
-             # Fallback for OHLCV
-             self.ax1.plot(df.index, df['close'], color='#4CAF50', label='Price')
-             self.ax1.set_title("실시간 1분봉 차트", color='white', fontproperties=font_prop)
+        # Using simple index for x-axis in tick chart as timestamps are irregular
+        x_vals = self._x if prices.size == self._x.size else np.arange(prices.size)
+        self.line.set_data(x_vals, prices)
+        
+        lo, hi = prices.min(), prices.max()
+        y_lo, y_hi = self.ax1.get_ylim()
+        x_hi = max(prices.size - 1, 1)
+        out_of_view = lo < y_lo or hi > y_hi or (hi - lo) < (y_hi - y_lo) * 0.5
+        if self.background is None or out_of_view or self._x_hi != x_hi:
+            # Axis limits change: full redraw, the background is re-cached in _on_draw
+            pad = (hi - lo) * 0.1 or abs(hi) * 0.001 or 1.0
+            if self._x_hi != x_hi:
+                self.ax1.set_xlim(0, x_hi)
+                self._x_hi = x_hi
+            self.ax1.set_ylim(lo - pad, hi + pad)
+            self.canvas.draw()
+            return
+            
+        self.canvas.restore_region(self.background)
+        self.ax1.draw_artist(self.line)
+        self.canvas.blit(self.ax1.bbox)
+        
+def _load_chart_font():
+    # Load font for Korean support in Matplotlib
+    # Windows font path example
+    try:
+        from matplotlib import font_manager, rc
+        font_path = "C:/Windows/Fonts/malgun.ttf"
+        if os.path.exists(font_path):
+            font = font_manager.FontProperties(fname=font_path).get_name()
+            rc('font', family=font)
+            return font_manager.FontProperties(fname=font_path)
+    except:
+        pass
+    return None
 
-        self.ax1.grid(True, color='#444')
-        self.figure.tight_layout()
-        self.canvas.draw()
-        
-# Load font for Korean support in Matplotlib
-# Windows font path example
-try:
-    from matplotlib import font_manager, rc
-    font_path = "C:/Windows/Fonts/malgun.ttf"
-    if os.path.exists(font_path):
-        font = font_manager.FontProperties(fname=font_path).get_name()
-        rc('font', family=font)
-        font_prop = font_manager.FontProperties(fname=font_path)
-    else:
-        font_prop = None
-except:
-    font_prop = None
+# Dark Theme using QSS (Qt Style Sheets) for better visibility control.
+# Applied once on the QApplication so Qt parses it a single time for all widgets.
+_QSS = """
+    /* Default text color comes from the application palette (see __main__),
+       so the dashboard labels can switch colors with setPalette */
+    QMainWindow, QWidget {
+        background-color: #353535;
+    }
+    QGroupBox {
+        border: 2px solid #555;
+        border-radius: 5px;
+        margin-top: 10px;
+        font-weight: bold;
+        color: #ffffff;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 3px 0 3px;
+    }
+    QLabel {
+        font-size: 13px;
+    }
+    QLineEdit, QDoubleSpinBox {
+        background-color: #252525;
+        color: #ffffff;
+        border: 1px solid #555;
+        padding: 5px;
+        border-radius: 3px;
+        selection-background-color: #4CAF50;
+    }
+    QComboBox {
+        background-color: #252525;
+        color: #ffffff;
+        border: 1px solid #555;
+        padding: 5px;
+        border-radius: 3px;
+        selection-background-color: #4CAF50;
+    }
+    QComboBox QAbstractItemView {
+        background-color: #353535;
+        color: #ffffff;
+        selection-background-color: #4CAF50;
+    }
+    QTextEdit, QPlainTextEdit {
+        background-color: #1e1e1e; 
+        color: #00ff00; 
+        border: 1px solid #444;
+        font-family: Consolas, Monospace;
+    }
+    QPushButton {
+        background-color: #555;
+        color: white;
+        border: 1px solid #444;
+        padding: 8px;
+        border-radius: 4px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #666;
+    }
+    QPushButton:pressed {
+        background-color: #444;
+    }
+    QCheckBox {
+        color: #ffffff;
+        spacing: 5px;
+    }
+    QCheckBox::indicator {
+        width: 15px;
+        height: 15px;
+    }
+"""
+# Drop comments and collapse whitespace, less for the QSS tokenizer to walk
+_QSS = re.sub(r"/\*.*?\*/", "", _QSS)
+_QSS = re.sub(r"\s+", " ", _QSS).strip()
+
+# Dashboard label color states
+_UP, _DOWN, _NEUTRAL = "up", "down", "neutral"
+_OVER, _UNDER = "over", "under"
+_POS, _NEG = "pos", "neg"
+_TOTAL = "total" # fixed color of the total asset label
+_STATE_COLORS = {
+    _UP: "#eb4034", # Red (Rise upbit style)
+    _DOWN: "#1261c4", # Blue (Fall)
+    _UNDER: "#00ff00", # Green for oversold
+    _OVER: "#ff0000", # Red for overbought
+    _POS: "#00ff00",
+    _NEG: "#ff0000",
+    _NEUTRAL: "#ffffff",
+    _TOTAL: "#4CAF50",
+}
+
+# Dashboard formatters, built once. Price decimals depend on magnitude:
+# < 1 -> 0.0061, < 100 -> 12.50, else 1,000
+_PRICE_FMT = ("{:,.4f} 원".format, "{:,.2f} 원".format, "{:,.0f} 원".format)
+_KRW_FMT = _PRICE_FMT[2]
+_RSI_FMT = "{:.1f}".format
+_PNL_FMT = "{:+.2f} %".format
 
 class AntiGravityBot(QMainWindow):
     def __init__(self):
@@ -465,6 +1169,33 @@ class AntiGravityBot(QMainWindow):
         self.setWindowTitle("안티 그래비티 봇 (Upbit RSI Scalping)")
         self.setGeometry(100, 100, 1200, 700) # Wider window
         
+        # Log lines are collected here and flushed at 10 Hz
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start()
+        
+        # Hash of the last config handed to the writer by save_settings
+        self._settings_hash = None
+        self.settings_writer = SettingsWriterWorker(CONFIG_PATH)
+        self.settings_writer.write_done.connect(self._on_settings_written)
+        self.settings_writer.start()
+        
+        # Dashboard repaints are coalesced the same way
+        self._dash_pending = None
+        self._last_dash = None
+        self._dash_timer = QTimer(self)
+        self._dash_timer.setInterval(100)
+        self._dash_timer.timeout.connect(self._flush_dashboard)
+        self._dash_timer.start()
+        
+        # Chart ticks are appended as they arrive and drawn at most 10 times per second
+        self._chart_timer = QTimer(self)
+        self._chart_timer.setInterval(100)
+        self._chart_timer.timeout.connect(self._flush_chart)
+        self._chart_timer.start()
+        
         self.worker = RSIWorker()
         self.worker.log_signal.connect(self.append_log)
         self.worker.status_signal.connect(self.update_dashboard)
@@ -474,7 +1205,6 @@ class AntiGravityBot(QMainWindow):
 
         self.init_ui()
         self.load_settings() # Load config on startup
-        self.apply_theme()
         
         # Track initial asset for Cumulative Return calculation (Real Trading)
         # Managed via load_settings
@@ -498,32 +1228,18 @@ class AntiGravityBot(QMainWindow):
         self.input_ticker.setInsertPolicy(QComboBox.InsertPolicy.NoInsert) # Prevent adding new items
         
         # Enable substring matching (e.g. "비트" finds "비트코인")
-        completer = QCompleter(self.input_ticker.model())
-        completer.setFilterMode(Qt.MatchFlag.MatchContains)
-        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
-        self.input_ticker.setCompleter(completer)
+        self.ticker_completer = TickerCompleter(self)
+        self.input_ticker.setCompleter(self.ticker_completer)
         
-        try:
-            # Fetch all markets with details
-            url = "https://api.upbit.com/v1/market/all?isDetails=false"
-            resp = requests.get(url)
-            if resp.status_code == 200:
-                markets = resp.json()
-                krw_markets = [m for m in markets if m['market'].startswith("KRW-")]
-                
-                items = []
-                for m in krw_markets:
-                    name = f"{m['korean_name']} ({m['market']})"
-                    items.append(name)
-                
-                self.input_ticker.addItems(items)
-                # Helper: Refresh completer model if items added later
-                # But here we add immediately, so usually fine.
-            else:
-                 tickers = pyupbit.get_tickers(fiat="KRW")
-                 self.input_ticker.addItems(tickers)
-        except:
-            self.input_ticker.addItem("비트코인 (KRW-BTC)")
+        # Fill from the disk cache right away, refresh in the background only if stale
+        items, is_fresh = MarketListWorker.load_cache()
+        if items:
+            self.populate_tickers(items)
+            
+        self.market_worker = MarketListWorker()
+        self.market_worker.markets_ready.connect(self.populate_tickers)
+        if not is_fresh:
+            self.market_worker.start()
             
         self.input_rsi = QDoubleSpinBox()
         self.input_rsi.setRange(0, 100)
@@ -636,7 +1352,15 @@ class AntiGravityBot(QMainWindow):
         self.lbl_profit.setFont(font_big)
         self.lbl_cumulative.setFont(font_big)
         self.lbl_total.setFont(font_big)
-        self.lbl_total.setStyleSheet("color: #4CAF50;") 
+        
+        # One palette per color state, swapped per tick instead of restyling the labels
+        self._palettes = {}
+        for state, color in _STATE_COLORS.items():
+            pal = QPalette(self.lbl_price.palette())
+            pal.setColor(QPalette.ColorRole.WindowText, QColor(color))
+            self._palettes[state] = pal
+        self._label_state = {}
+        self._set_color_state(self.lbl_total, _TOTAL)
         
         info_layout.addWidget(QLabel("현재가:"), 0, 0); info_layout.addWidget(self.lbl_price, 0, 1)
         info_layout.addWidget(QLabel("실시간 RSI:"), 1, 0); info_layout.addWidget(self.lbl_rsi, 1, 1)
@@ -648,8 +1372,11 @@ class AntiGravityBot(QMainWindow):
         
         # Log Window
         right_layout.addWidget(QLabel("시스템 로그:"))
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(2000) # Drop oldest lines instead of growing forever
+        self.log_text.setUndoRedoEnabled(False) # implied by the block limit, no undo history for a log
+        # Word wrap stays on: NoWrap measured slower here (horizontal extent tracking)
         self.log_text.setStyleSheet("background-color: #222; color: #0f0; font-family: Consolas;")
         right_layout.addWidget(self.log_text)
         
@@ -684,88 +1411,52 @@ class AntiGravityBot(QMainWindow):
         
         main_layout.addWidget(splitter)
 
-    def apply_theme(self):
-        # Dark Theme using QSS (Qt Style Sheets) for better visibility control
-        self.setStyleSheet("""
-            QMainWindow, QWidget {
-                background-color: #353535;
-                color: #ffffff;
-            }
-            QGroupBox {
-                border: 2px solid #555;
-                border-radius: 5px;
-                margin-top: 10px;
-                font-weight: bold;
-                color: #ffffff;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px 0 3px;
-            }
-            QLabel {
-                color: #ffffff;
-                font-size: 13px;
-            }
-            QLineEdit, QDoubleSpinBox {
-                background-color: #252525;
-                color: #ffffff;
-                border: 1px solid #555;
-                padding: 5px;
-                border-radius: 3px;
-                selection-background-color: #4CAF50;
-            }
-            QComboBox {
-                background-color: #252525;
-                color: #ffffff;
-                border: 1px solid #555;
-                padding: 5px;
-                border-radius: 3px;
-                selection-background-color: #4CAF50;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #353535;
-                color: #ffffff;
-                selection-background-color: #4CAF50;
-            }
-            QTextEdit {
-                background-color: #1e1e1e; 
-                color: #00ff00; 
-                border: 1px solid #444;
-                font-family: Consolas, Monospace;
-            }
-            QPushButton {
-                background-color: #555;
-                color: white;
-                border: 1px solid #444;
-                padding: 8px;
-                border-radius: 4px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #666;
-            }
-            QPushButton:pressed {
-                background-color: #444;
-            }
-            QCheckBox {
-                color: #ffffff;
-                spacing: 5px;
-            }
-            QCheckBox::indicator {
-                width: 15px;
-                height: 15px;
-            }
-        """)
-        
-    def update_worker_settings(self):
-        # Extract 'KRW-BTC' from '비트코인 (KRW-BTC)'
-        raw_text = self.input_ticker.currentText()
-        if "(" in raw_text and ")" in raw_text:
-            ticker = raw_text.split("(")[1].split(")")[0]
-        else:
-            ticker = raw_text
+    @pyqtSlot(list)
+    def populate_tickers(self, items):
+        # items: [(display, code), ...], the code is kept as item data
+        existing = [(self.input_ticker.itemText(i), self.input_ticker.itemData(i)) for i in range(self.input_ticker.count())]
+        if not items:
+            # Fetch failed: keep the cached list if we have one
+            if existing:
+                return
+            items = [("비트코인 (KRW-BTC)", "KRW-BTC")]
+        if items == existing:
+            return
+            
+        # Keep the ticker restored by load_settings while the list was loading
+        current = self.current_ticker()
+        self.input_ticker.clear()
+        for display, code in items:
+            self.input_ticker.addItem(display, code)
+        self.ticker_completer.set_items([display for display, code in items])
+        self.select_ticker(current)
+
+    def current_ticker(self):
+        """Market code of the combo selection, e.g. 'KRW-BTC'."""
+        text = self.input_ticker.currentText()
+        index = self.input_ticker.currentIndex()
+        if index >= 0 and self.input_ticker.itemText(index) == text:
+            return self.input_ticker.itemData(index)
             
+        # Typed by hand: extract 'KRW-BTC' from '비트코인 (KRW-BTC)'
+        if "(" in text and ")" in text:
+            return text.split("(")[1].split(")")[0]
+        return text
+
+    def select_ticker(self, ticker):
+        if not ticker:
+            return
+        index = self.input_ticker.findData(ticker)
+        if index < 0:
+            # Older config.json files stored the display text
+            index = self.input_ticker.findText(ticker)
+        if index >= 0:
+            self.input_ticker.setCurrentIndex(index)
+        else:
+            self.input_ticker.setCurrentText(ticker)
+
+    def update_worker_settings(self):
+        ticker = self.current_ticker()
         rsi = self.input_rsi.value()
         target = self.input_roi_target.value()
         stop = self.input_roi_stop.value()
@@ -785,18 +1476,17 @@ class AntiGravityBot(QMainWindow):
         self.save_settings()
 
     def load_settings(self):
-        config_path = "config.json"
-        if os.path.exists(config_path):
+        config_path = CONFIG_PATH
+        try:
+            # One stat() instead of exists() + open(), the parse is skipped if the file is unchanged
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is not None:
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                config = _load_config(config_path, mtime_ns)
                     
-                target_ticker = config.get("ticker", "KRW-BTC")
-                index = self.input_ticker.findText(target_ticker)
-                if index >= 0:
-                    self.input_ticker.setCurrentIndex(index)
-                else:
-                    self.input_ticker.setCurrentText(target_ticker)
+                self.select_ticker(config.get("ticker", "KRW-BTC"))
                     
                 self.input_rsi.setValue(config.get("rsi", 25.0))
                 self.input_roi_target.setValue(config.get("roi_target", 0.5))
@@ -830,7 +1520,7 @@ class AntiGravityBot(QMainWindow):
 
     def save_settings(self):
         config = {
-            "ticker": self.input_ticker.currentText(),
+            "ticker": self.current_ticker(), # canonical code, e.g. KRW-BTC
             "rsi": self.input_rsi.value(),
             "roi_target": self.input_roi_target.value(),
             "roi_stop": self.input_roi_stop.value(),
@@ -851,13 +1541,29 @@ class AntiGravityBot(QMainWindow):
             # Save Real Trading Start Asset
             "real_start_asset": self.real_start_asset
         }
+        # Nothing changed since the last write
+        settings_hash = hash(tuple(sorted(config.items())))
+        if settings_hash == self._settings_hash:
+            return
+            
         try:
-            with open("config.json", 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
-            self.append_log("Settings saved to config.json")
+            # Serialize here (cheap), the disk write happens on settings_writer
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            self.settings_writer.submit(data, settings_hash)
+            self._settings_hash = settings_hash
         except Exception as e:
              self.append_log(f"Failed to save settings: {e}")
 
+    @pyqtSlot(object, str)
+    def _on_settings_written(self, settings_hash, error):
+        if not error:
+            self.append_log("Settings saved to config.json")
+            return
+        self.append_log(f"Failed to save settings: {error}")
+        if self._settings_hash == settings_hash:
+            # Let the next save_settings retry the same config
+            self._settings_hash = None
+
     def toggle_trading(self, checked):
         self.worker.auto_active = checked
         if checked:
@@ -871,49 +1577,70 @@ class AntiGravityBot(QMainWindow):
 
     @pyqtSlot(str)
     def append_log(self, msg):
-        self.log_text.append(msg)
+        # Buffered, _flush_log writes bursts with a single append
+        self._log_buf.append(msg)
         
-    @pyqtSlot(pd.DataFrame)
-    def update_chart_data(self, df):
-        self.chart_widget.update_chart(df)
+    def _flush_log(self):
+        if self._log_buf:
+            # Lines beyond the block limit would be dropped right away, don't lay them out
+            batch = self._log_buf[-self.log_text.maximumBlockCount():]
+            self.log_text.appendPlainText("\n".join(batch))
+            self._log_buf.clear()
+        
+    @pyqtSlot(str, object)
+    def update_chart_data(self, ticker, ticks):
+        self.chart_widget.append_ticks(ticker, ticks)
+        
+    def _flush_chart(self):
+        self.chart_widget.redraw()
 
     @pyqtSlot(float, float, float, float, float)
     def update_dashboard(self, price, rsi, profit, total_asset, change_rate):
+        # Coalesced: only the latest status is drawn by _flush_dashboard
+        self._dash_pending = (price, rsi, profit, total_asset, change_rate)
+
+    def _flush_dashboard(self):
+        if self._dash_pending is None:
+            return
+        price, rsi, profit, total_asset, change_rate = self._dash_pending
+        self._dash_pending = None
+        
+        # Skip repainting when nothing visible changed since the last frame
+        has_rsi = math.isfinite(rsi)
+        key = (round(price, 4), round(rsi, 2) if has_rsi else None, round(profit, 2), round(total_asset), round(change_rate, 3), self.worker.simulation_mode)
+        if key == self._last_dash:
+            return
+        self._last_dash = key
+        
         # Current Price with Color
         # Dynamic Decimal Places
-        if price < 1:
-            price_str = f"{price:,.4f}" # e.g. 0.0061
-        elif price < 100:
-            price_str = f"{price:,.2f}" # e.g. 12.50
-        else:
-            price_str = f"{price:,.0f}" # e.g. 1,000
-            
-        self.lbl_price.setText(f"{price_str} 원")
+        bucket = 0 if price < 1 else 1 if price < 100 else 2
+        self.lbl_price.setText(_PRICE_FMT[bucket](price))
         if change_rate > 0:
-            self.lbl_price.setStyleSheet("color: #eb4034;") # Red (Rise upbit style)
+            self._set_color_state(self.lbl_price, _UP)
         elif change_rate < 0:
-            self.lbl_price.setStyleSheet("color: #1261c4;") # Blue (Fall)
+            self._set_color_state(self.lbl_price, _DOWN)
         else:
-            self.lbl_price.setStyleSheet("color: white;")
+            self._set_color_state(self.lbl_price, _NEUTRAL)
             
-        self.lbl_rsi.setText(f"{rsi:.1f}")
-        self.lbl_total.setText(f"{total_asset:,.0f} 원") # Update Total Asset
+        self.lbl_rsi.setText(_RSI_FMT(rsi) if has_rsi else "-")
+        self.lbl_total.setText(_KRW_FMT(total_asset)) # Update Total Asset
         
         # Color coding RSI
         if rsi <= 30: 
-            self.lbl_rsi.setStyleSheet("color: #0f0;") # Green for oversold
+            self._set_color_state(self.lbl_rsi, _UNDER)
         elif rsi >= 70:
-             self.lbl_rsi.setStyleSheet("color: #f00;") # Red for overbought
+            self._set_color_state(self.lbl_rsi, _OVER)
         else:
-            self.lbl_rsi.setStyleSheet("color: white;")
+            self._set_color_state(self.lbl_rsi, _NEUTRAL)
             
-        self.lbl_profit.setText(f"{profit:+.2f} %")
+        self.lbl_profit.setText(_PNL_FMT(profit))
         if profit > 0:
-            self.lbl_profit.setStyleSheet("color: #0f0;")
+            self._set_color_state(self.lbl_profit, _POS)
         elif profit < 0:
-            self.lbl_profit.setStyleSheet("color: #f00;")
+            self._set_color_state(self.lbl_profit, _NEG)
         else:
-            self.lbl_profit.setStyleSheet("color: white;")
+            self._set_color_state(self.lbl_profit, _NEUTRAL)
 
         # Cumulative Return Calculation
         if self.worker.simulation_mode:
@@ -932,27 +1659,69 @@ class AntiGravityBot(QMainWindow):
         else:
             cum_rate = 0.0
             
-        self.lbl_cumulative.setText(f"{cum_rate:+.2f} %")
+        self.lbl_cumulative.setText(_PNL_FMT(cum_rate))
         if cum_rate > 0:
-            self.lbl_cumulative.setStyleSheet("color: #0f0;")
+            self._set_color_state(self.lbl_cumulative, _POS)
         elif cum_rate < 0:
-            self.lbl_cumulative.setStyleSheet("color: #f00;")
+            self._set_color_state(self.lbl_cumulative, _NEG)
         else:
-            self.lbl_cumulative.setStyleSheet("color: white;")
+            self._set_color_state(self.lbl_cumulative, _NEUTRAL)
+
+    def _set_color_state(self, label, state):
+        # Plain palette swap, only when the color actually changes
+        if self._label_state.get(label) != state:
+            self._label_state[label] = state
+            label.setPalette(self._palettes[state])
 
     @pyqtSlot(str)
     def update_status_msg(self, msg):
         self.lbl_trade_status.setText(msg)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.worker.set_chart_active(True)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.chart_widget.canvas is None:
+            # The first frame is on screen, now load matplotlib for the chart
+            QTimer.singleShot(0, self.chart_widget.build_plot)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.worker.set_chart_active(False)
+
+    def changeEvent(self, event):
+        # Minimizing does not hide the window on every platform
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.worker.set_chart_active(not self.isMinimized())
+        super().changeEvent(event)
+
     def closeEvent(self, event):
         """Save settings and state on app close"""
-        self.save_settings()
-        self.worker.running = False
-        self.worker.wait()
+        self.save_settings() # queued on settings_writer, drained below
+        # Bounded: a hung exchange request must not freeze the window on close
+        self.worker.stop()
+        _join_thread(self.worker)
+        # The market list has nothing to save: drop its result instead of waiting for the fetch
+        try:
+            self.market_worker.markets_ready.disconnect(self.populate_tickers)
+        except TypeError:
+            pass # already disconnected by an earlier close
+        self.market_worker.stop()
+        # Drain the pending config write before the process exits
+        self.settings_writer.stop()
+        self.settings_writer.wait()
         event.accept()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setStyleSheet(_QSS)
+    # Default text color of the dark theme, the QSS leaves it to the palette
+    palette = app.palette()
+    for role in (QPalette.ColorRole.WindowText, QPalette.ColorRole.Text, QPalette.ColorRole.ButtonText):
+        palette.setColor(role, QColor("#ffffff"))
+    app.setPalette(palette)
     window = AntiGravityBot()
     window.show()
     sys.exit(app.exec())